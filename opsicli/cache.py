@@ -69,6 +69,12 @@ class Cache(metaclass=Singleton):
 		if store:
 			self.store()
 
+	def delete(self, name: str) -> None:
+		self._ensure_loaded()
+		if name in self._data:
+			del self._data[name]
+			self._modified = True
+
 	def ttl_exceeded(self, name: str) -> bool:
 		return 0 < self._data[name]["ttl"] < self.age(name)
 
@@ -245,15 +245,16 @@ def write_output_json(data: Any, metadata: Metadata | None = None, pretty: bool
 			return value.__name__
 		return str(value)
 
+	print_to_tty = pretty and output_file_is_a_tty()
 	option = 0
-	if pretty and not output_file_is_a_tty():
+	if pretty and not print_to_tty:
 		option |= orjson.OPT_APPEND_NEWLINE | orjson.OPT_INDENT_2
 
 	json = orjson.dumps(
 		{"metadata": metadata.as_dict(), "data": data} if config.metadata and metadata else data, default=to_string, option=option
 	)
 
-	if pretty and output_file_is_a_tty():
+	if print_to_tty:
 		print_json(json.decode("utf-8"), highlight=config.color)
 	else:
 		with output_file_bin() as file:
@@ -11,6 +11,7 @@ import sys
 import time
 from contextlib import contextmanager
 from dataclasses import dataclass, field
+from logging import DEBUG
 from threading import Event, Lock
 from types import FrameType
 from typing import Any, Callable, Generator, Literal, cast
@@ -58,12 +59,16 @@ else:
 CHANNEL_SUB_TIMEOUT = 15.0
 JSONRPC_TIMEOUT = 15.0
 PROCESS_START_TIMEOUT = 15.0
+# The selector returns as soon as stdin is readable, the timeout only limits how fast a close is noticed
+STDIN_SELECT_TIMEOUT = 0.1
 
 logger = get_logger("opsicli")
 
 
 def log_message(message: Message) -> None:
 	logger.info("Got message of type %s", message.type)
+	if not logger.isEnabledFor(DEBUG):
+		return
 	debug_string = ""
 	for key, value in message.to_dict().items():
 		debug_string += f"\t{key}: {value}\n"
@@ -541,23 +546,21 @@ class TerminalMessagebusConnection(MessagebusConnection):
 			return
 
 		if self._is_windows:
-			chars = list(message.data)
-			for idx, char in enumerate(chars):
-				if char == 27 and chars[idx + 1] == 91 and chars[idx + 2] == 63 and chars[idx + 3] == 49:
-					# ESC[?1
-					if chars[idx + 4] == 104:
-						if not self._application_mode:
-							logger.debug("Enter application mode")
-							self._application_mode = True
-					else:
-						if self._application_mode:
-							logger.debug("Exit application mode")
-							self._application_mode = False
-			sys.stdout.buffer.write(message.data)
-			sys.stdout.flush()
-		else:
-			sys.stdout.buffer.write(message.data)
-			sys.stdout.flush()
+			# ESC[?1
+			idx = message.data.find(b"\x1b[?1")
+			while idx != -1:
+				mode = message.data[idx + 4 : idx + 5]
+				if mode == b"h":
+					if not self._application_mode:
+						logger.debug("Enter application mode")
+						self._application_mode = True
+				elif mode:
+					if self._application_mode:
+						logger.debug("Exit application mode")
+						self._application_mode = False
+				idx = message.data.find(b"\x1b[?1", idx + 4)
+		sys.stdout.buffer.write(message.data)
+		sys.stdout.flush()
 
 	def _on_terminal_error(self, message: TerminalErrorMessage) -> None:
 		if message.terminal_id != self.terminal_id:
@@ -660,6 +663,8 @@ class TerminalMessagebusConnection(MessagebusConnection):
 			if self._should_close.is_set():
 				return
 			assert self._terminal_write_channel
+			write_channel = self._terminal_write_channel
+			send_message = self.send_message
 			logger.notice("Return to local shell with 'exit' or 'Ctrl+D'")
 			with raw_terminal():
 				if self._is_windows:
@@ -702,7 +707,7 @@ class TerminalMessagebusConnection(MessagebusConnection):
 						if not data:
 							continue
 					else:
-						if not selector.select(0.005):
+						if not selector.select(STDIN_SELECT_TIMEOUT):
 							continue
 						data = sys.stdin.buffer.read()
 
@@ -719,10 +724,11 @@ class TerminalMessagebusConnection(MessagebusConnection):
 							self._should_close.set()
 							break
 
-					message = TerminalDataWriteMessage(
-						sender=CONNECTION_USER_CHANNEL,
-						channel=self._terminal_write_channel,
-						terminal_id=self.terminal_id,
-						data=data,
+					send_message(
+						TerminalDataWriteMessage(
+							sender=CONNECTION_USER_CHANNEL,
+							channel=write_channel,
+							terminal_id=self.terminal_id,
+							data=data,
+						)
 					)
-					self.send_message(message)
@@ -16,7 +16,6 @@ import stat
 import string
 import sys
 import time
-from collections import defaultdict
 from contextlib import contextmanager
 from functools import lru_cache
 from pathlib import Path
@@ -50,6 +49,8 @@ class Singleton(type):
 
 
 class ProgressCallbackAdapter:
+	__slots__ = ("progress", "started", "task_id")
+
 	def __init__(self, progress: Progress, task_message: str):
 		self.progress = progress
 		self.started = False
@@ -310,20 +311,13 @@ def retry(
 	return decorator
 
 
-def create_nested_dict(items: list[object], attributes: list[str]) -> dict:
+def create_flat_dict(items: list[object], attributes: list[str]) -> dict[tuple, Any]:
 	"""
 	Parameters:
 	items: List of objects to be converted into a dictionary.
 	attributes: List of attribute names to be used as keys in the dictionary.
 
 	Returns:
-	A nested dictionary where each level corresponds to an attribute in attributes.
+	A dictionary keyed by tuples of the attribute values of each item.
 	"""
-	info_dict: dict[Any, Any] = defaultdict(dict)
-	for item in items:
-		current_level = info_dict
-		for key in attributes[:-1]:
-			key_value = getattr(item, key, None)
-			current_level = current_level.setdefault(key_value, defaultdict(dict))
-		current_level[getattr(item, attributes[-1] if attributes else "", "")] = item
-	return info_dict
+	return {tuple(getattr(item, key, None) for key in attributes): item for item in items}
@@ -4,6 +4,8 @@ opsi-cli basic command line interface for opsi
 jsonrpc plugin
 """
 
+from bisect import bisect_left
+from itertools import islice
 from typing import Any
 
 import orjson
@@ -23,12 +25,26 @@ __version__ = "0.1.0"
 
 logger = get_logger("opsicli")
 
+# Interface sorted by method name, completion bisects into it
+INTERFACE_CACHE_KEY = "jsonrpc-interface-sorted"
+# Written unsorted by older versions
+LEGACY_INTERFACE_CACHE_KEYS = ("jsonrpc-interface", "jsonrpc-interface-raw")
 
-def cache_interface(interface: list[dict[str, Any]]) -> None:
-	if cache.age("jsonrpc-interface") >= 3600:
-		cache.set("jsonrpc-interface", {m["name"]: {"params": m["params"]} for m in interface})
-	if cache.age("jsonrpc-interface-raw") >= 3600:
-		cache.set("jsonrpc-interface-raw", interface)
+
+def cache_interface() -> None:
+	if cache.age(INTERFACE_CACHE_KEY) < 3600:
+		logger.debug("Using cached interface")
+		return
+
+	client = get_service_connection()
+	interface = client.jsonrpc("backend_getInterface")
+	cache.set(INTERFACE_CACHE_KEY, sorted(interface, key=get_method_name))
+	for key in LEGACY_INTERFACE_CACHE_KEYS:
+		cache.delete(key)
+
+
+def get_method_name(method: dict[str, Any]) -> str:
+	return method["name"]
 
 
 @click.group(name="jsonrpc", short_help="opsi JSONRPC client")
@@ -43,9 +59,7 @@ def cli(ctx: click.Context) -> None:
 	logger.trace("jsonrpc command")
 
 	# Cache interface for later
-	client = get_service_connection()
-	interface = client.jsonrpc("backend_getInterface")
-	cache_interface(interface)
+	cache_interface()
 
 
 @cli.command(short_help="Get JSONRPC method list")
@@ -54,37 +68,51 @@ def methods() -> None:
 	opsi-cli jsonrpc methods subcommand.
 	"""
 	metadata = command_metadata.get("jsonrpc_methods")
-	write_output(cache.get("jsonrpc-interface-raw"), metadata=metadata, default_output_format="table")
+	write_output(cache.get(INTERFACE_CACHE_KEY), metadata=metadata, default_output_format="table")
 
 
 def complete_methods(ctx: click.Context, param: click.Parameter, incomplete: str) -> list[CompletionItem]:
-	interface = cache.get("jsonrpc-interface")
+	interface = cache.get(INTERFACE_CACHE_KEY)
 	if not interface:
 		return []
+	# Methods are cached sorted by name, matches are a contiguous range
 	items = []
-	for method_name in interface:
-		if method_name.startswith(incomplete):
-			items.append(CompletionItem(method_name))
+	for method in islice(interface, bisect_left(interface, incomplete, key=get_method_name), None):
+		if not method["name"].startswith(incomplete):
+			break
+		items.append(CompletionItem(method["name"]))
 	return items
 
 
 def complete_params(ctx: click.Context, param: click.Parameter, incomplete: str) -> list[CompletionItem]:
-	interface = cache.get("jsonrpc-interface")
+	interface = cache.get(INTERFACE_CACHE_KEY)
 	if not interface:
 		return []
 
-	method_info = interface.get(ctx.params["method"])
-	if not method_info:
+	ctx_params = ctx.params
+	method_name = ctx_params.get("method")
+	if not method_name:
+		return []
+	idx = bisect_left(interface, method_name, key=get_method_name)
+	if idx == len(interface) or interface[idx]["name"] != method_name:
 		return []
 
-	params = ctx.params["params"]
+	params = ctx_params.get("params") or ()
 	try:
-		param_name = method_info["params"][len(params)]
+		param_name = interface[idx]["params"][len(params)]
 		return [CompletionItem(param_name)]
 	except IndexError:
 		return []
 
 
+def parse_param(param: str) -> Any:
+	try:
+		return orjson.loads(param)
+	except orjson.JSONDecodeError:
+		# Not valid JSON, pass as plain string
+		return param
+
+
 @cli.command(short_help="Execute JSONRPC")
 @click.argument("method", type=str, shell_complete=complete_methods)
 @click.argument("params", type=str, nargs=-1, shell_complete=complete_params)
@@ -97,12 +125,7 @@ def execute(method: str, params: list[str] | None = None) -> None:
 
 	if params:
 		logger.debug("Raw parameters: %s", params)
-		params = list(params)
-		for idx, param in enumerate(params):
-			try:
-				params[idx] = orjson.loads(param)
-			except orjson.JSONDecodeError:
-				params[idx] = orjson.loads(f'"{param}"')
+		params = [parse_param(param) for param in params]
 	else:
 		params = []
 
@@ -2,9 +2,15 @@
 opsi-cli manage-repo
 """
 
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
+from typing import TYPE_CHECKING, Generator
 
-import requests  # type: ignore[import]
 import rich_click as click  # type: ignore[import]
 from opsicommon.logging import get_logger
 from opsicommon.package.repo_meta import (
@@ -15,6 +21,14 @@ from opsicommon.package.repo_meta import (
 
 from opsicli.plugin import OPSICLIPlugin
 
+if sys.platform == "win32":
+	import msvcrt
+else:
+	import fcntl
+
+if TYPE_CHECKING:
+	import requests  # type: ignore[import]
+
 __version__ = "0.2.0"
 __description__ = "This command manages repositories for opsi packages"
 
@@ -23,21 +37,102 @@ logger = get_logger("opsicli")
 
 
 CHANGELOG_SERVER = "https://changelog.opsi.org"
+URL_PROBE_WORKERS = 8
+# Windows only, on POSIX the repository directory itself is locked
+METAFILE_LOCK_FILE = ".packages.lock"
+METAFILE_LOCK_RETRY_INTERVAL = 1.0
+
+
+@lru_cache
+def get_changelog_session() -> "requests.Session":
+	import requests  # type: ignore[import]
+	from requests.adapters import HTTPAdapter  # type: ignore[import]
 
+	# Keep connections to the changelog server alive between probes
+	session = requests.Session()
+	session.headers["User-Agent"] = f"opsi-cli-manage-repo/{__version__}"
+	session.mount("https://", HTTPAdapter(pool_maxsize=URL_PROBE_WORKERS))
+	return session
 
+
+@lru_cache
 def url_exists(url: str) -> bool:
-	result = requests.head(url, timeout=(5, 5))
+	result = get_changelog_session().head(url, timeout=(5, 5))
 	return result.status_code >= 200 and result.status_code < 300
 
 
-def add_changelog_and_releasenote_url(package: RepoMetaPackage) -> None:
+def get_changelog_and_releasenote_url(package: RepoMetaPackage) -> tuple[str, str]:
 	base_url = f"{CHANGELOG_SERVER}/OPSI_PACKAGE/{package.product_id}"
-	changelog_url = f"{base_url}/changelog.txt"
-	release_notes_url = f"{base_url}/release_notes.txt"
-	if url_exists(changelog_url):
-		package.changelog_url = changelog_url
-	if url_exists(release_notes_url):
-		package.release_notes_url = release_notes_url
+	return f"{base_url}/changelog.txt", f"{base_url}/release_notes.txt"
+
+
+def add_changelog_and_releasenote_urls(packages: list[RepoMetaPackage]) -> None:
+	urls = list(dict.fromkeys(url for package in packages for url in get_changelog_and_releasenote_url(package)))
+	# Create the shared session here, lru_cache does not serialize the first call from the workers
+	get_changelog_session()
+	with ThreadPoolExecutor(max_workers=URL_PROBE_WORKERS) as executor:
+		existing_urls = {url for url, exists in zip(urls, executor.map(url_exists, urls)) if exists}
+	for package in packages:
+		changelog_url, release_notes_url = get_changelog_and_releasenote_url(package)
+		if changelog_url in existing_urls:
+			package.changelog_url = changelog_url
+		if release_notes_url in existing_urls:
+			package.release_notes_url = release_notes_url
+
+
+def add_changelog_and_releasenote_url(package: RepoMetaPackage) -> None:
+	add_changelog_and_releasenote_urls([package])
+
+
+def get_meta_files(directory: Path) -> list[Path]:
+	try:
+		with os.scandir(directory) as entries:
+			return [Path(entry.path) for entry in entries if entry.name.startswith("packages.") and entry.is_file()]
+	except FileNotFoundError:
+		return []
+
+
+@contextmanager
+def lock_metafiles(directory: Path) -> Generator[None, None, None]:
+	"""
+	Lock the metafiles of a repository for the whole read-modify-write cycle.
+
+	Waits until a lock held by another process is released.
+	On Windows an empty lock file is left in the directory, removing it would allow
+	two processes to lock different files.
+	"""
+	if not directory.is_dir():
+		# Nothing to lock, callers report the missing metafiles
+		yield
+		return
+	if sys.platform == "win32":
+		with open(directory / METAFILE_LOCK_FILE, "ab") as lock_file:
+			lock_file.seek(0)
+			waiting = False
+			while True:
+				try:
+					msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+					break
+				except OSError:
+					if not waiting:
+						logger.notice("Waiting for metafile lock in '%s'", directory)
+						waiting = True
+					time.sleep(METAFILE_LOCK_RETRY_INTERVAL)
+			try:
+				yield
+			finally:
+				lock_file.seek(0)
+				msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+	else:
+		dir_fd = os.open(directory, os.O_RDONLY)
+		try:
+			fcntl.flock(dir_fd, fcntl.LOCK_EX)
+			try:
+				yield
+			finally:
+				fcntl.flock(dir_fd, fcntl.LOCK_UN)
+		finally:
+			os.close(dir_fd)
 
 
 @click.group(name="manage-repo", short_help="opsi-package-repository management.")
@@ -80,27 +175,31 @@ option_scan = click.option(
 def _metafile_update(
 	directory: Path, read: bool, format: list[str] | None = None, repository_name: str | None = None, scan: bool = False
 ) -> None:
-	current_meta_files = list(directory.glob("packages.*"))
-	packages_metadata = RepoMetaPackageCollection()
-	if read and current_meta_files:
-		packages_metadata.read_metafile(current_meta_files[0])
-	if repository_name:
-		packages_metadata.repository.name = repository_name
-	if scan:
-		packages_metadata.scan_packages(directory, add_callback=add_changelog_and_releasenote_url)
-
-	if format:
-		for suffix in format:
-			metadata_file = directory / f"packages.{suffix}"
-			if metadata_file in current_meta_files:
-				current_meta_files.remove(metadata_file)
-			packages_metadata.write_metafile(metadata_file)
-
-		for meta_file in current_meta_files:
-			meta_file.unlink()
-	else:
-		for metadata_file in current_meta_files:
-			packages_metadata.write_metafile(metadata_file)
+	with lock_metafiles(directory):
+		current_meta_files = get_meta_files(directory)
+		packages_metadata = RepoMetaPackageCollection()
+		if read and current_meta_files:
+			packages_metadata.read_metafile(current_meta_files[0])
+		if repository_name:
+			packages_metadata.repository.name = repository_name
+		if scan:
+			# Collect scanned packages and probe their changelog urls concurrently afterwards
+			scanned_packages: list[RepoMetaPackage] = []
+			packages_metadata.scan_packages(directory, add_callback=scanned_packages.append)
+			add_changelog_and_releasenote_urls(scanned_packages)
+
+		if format:
+			for suffix in format:
+				metadata_file = directory / f"packages.{suffix}"
+				if metadata_file in current_meta_files:
+					current_meta_files.remove(metadata_file)
+				packages_metadata.write_metafile(metadata_file)
+
+			for meta_file in current_meta_files:
+				meta_file.unlink()
+		else:
+			for metadata_file in current_meta_files:
+				packages_metadata.write_metafile(metadata_file)
 
 
 @metafile.command(short_help="Creates repository metadata files.", name="create")
@@ -133,7 +232,7 @@ def metafile_scan_packages(directory: Path) -> None:
 	"""
 	This command scans for opsi packages in the specified directory and updates the metadata files.
 	"""
-	current_meta_files = list(directory.glob("packages.*"))
+	current_meta_files = get_meta_files(directory)
 	if not current_meta_files:
 		raise RuntimeError(f"No metadata files found in '{directory}'")
 
@@ -158,22 +257,23 @@ def add_package(directory: Path, package: Path, num_allowed_versions: int, compa
 	"""
 	This command analyzes the specified opsi package and updates the meta-data file.
 	"""
-	current_meta_files = list(directory.glob("packages.*"))
-	if not current_meta_files:
-		raise RuntimeError(f"No metadata files found in '{directory}'")
+	with lock_metafiles(directory):
+		current_meta_files = get_meta_files(directory)
+		if not current_meta_files:
+			raise RuntimeError(f"No metadata files found in '{directory}'")
 
-	packages_metadata = RepoMetaPackageCollection()
-	packages_metadata.read_metafile(current_meta_files[0])
-	packages_metadata.add_package(
-		directory,
-		package,
-		num_allowed_versions=num_allowed_versions,
-		url=url,
-		compatibility=[RepoMetaPackageCompatibility.from_string(c) for c in compatibility or []],
-		add_callback=add_changelog_and_releasenote_url,
-	)
-	for meta_file in current_meta_files:
-		packages_metadata.write_metafile(meta_file)
+		packages_metadata = RepoMetaPackageCollection()
+		packages_metadata.read_metafile(current_meta_files[0])
+		packages_metadata.add_package(
+			directory,
+			package,
+			num_allowed_versions=num_allowed_versions,
+			url=url,
+			compatibility=[RepoMetaPackageCompatibility.from_string(c) for c in compatibility or []],
+			add_callback=add_changelog_and_releasenote_url,
+		)
+		for meta_file in current_meta_files:
+			packages_metadata.write_metafile(meta_file)
 
 
 @metafile.command(short_help="Removes a package from repository metadata files.", name="remove-package")
@@ -184,16 +284,17 @@ def remove_package(directory: Path, name: str, version: str) -> None:
 	"""
 	This command removes a package from repository metadata files.
 	"""
-	current_meta_files = list(directory.glob("packages.*"))
-	if not current_meta_files:
-		raise RuntimeError(f"No metadata files found in '{directory}'")
+	with lock_metafiles(directory):
+		current_meta_files = get_meta_files(directory)
+		if not current_meta_files:
+			raise RuntimeError(f"No metadata files found in '{directory}'")
 
-	packages_metadata = RepoMetaPackageCollection()
-	packages_metadata.read_metafile(current_meta_files[0])
+		packages_metadata = RepoMetaPackageCollection()
+		packages_metadata.read_metafile(current_meta_files[0])
 
-	packages_metadata.remove_package(name, version)
-	for meta_file in current_meta_files:
-		packages_metadata.write_metafile(meta_file)
+		packages_metadata.remove_package(name, version)
+		for meta_file in current_meta_files:
+			packages_metadata.write_metafile(meta_file)
 
 
 class CustomPlugin(OPSICLIPlugin):
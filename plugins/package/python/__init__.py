@@ -2,7 +2,9 @@
 opsi-cli package plugin
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import nullcontext
+from operator import itemgetter
 from pathlib import Path
 
 import rich_click as click  # type: ignore[import]
@@ -18,7 +20,7 @@ from opsicli.decorators import handle_list_attributes
 from opsicli.io import get_console, write_output
 from opsicli.opsiservice import get_depot_connection, get_service_connection
 from opsicli.plugin import OPSICLIPlugin
-from opsicli.utils import ProgressCallbackAdapter, create_nested_dict
+from opsicli.utils import ProgressCallbackAdapter, create_flat_dict
 from plugins.package.data.metadata import command_metadata
 
 from .package_helpers import (
@@ -27,6 +29,7 @@ from .package_helpers import (
 	fix_custom_package_name,
 	get_depot_objects,
 	get_property_default_values,
+	get_property_states,
 	install_package,
 	map_and_sort_packages,
 	process_local_packages,
@@ -104,18 +107,26 @@ def make(
 		md5_file: Path | None = None
 		zsync_file: Path | None = None
 		try:
-			if md5:
-				logger.info("Creating md5sum file for '%s'", package_archive)
-				progress_callback = (
-					ProgressCallbackAdapter(progress, "[cyan]Creating md5sum file...").progress_callback if not config.quiet else None
-				)
-				md5_file = create_package_md5_file(package_archive, progress_callback=progress_callback)
-			if zsync:
-				logger.info("Creating zsync file for '%s'", package_archive)
-				progress_callback = (
-					ProgressCallbackAdapter(progress, "[cyan]Creating zsync file...").progress_callback if not config.quiet else None
-				)
-				zsync_file = create_package_zsync_file(package_archive, progress_callback=progress_callback)
+			# md5 and zsync files are created independently from the same archive
+			with ThreadPoolExecutor(max_workers=2) as executor:
+				md5_future = None
+				zsync_future = None
+				if md5:
+					logger.info("Creating md5sum file for '%s'", package_archive)
+					progress_callback = (
+						ProgressCallbackAdapter(progress, "[cyan]Creating md5sum file...").progress_callback if not config.quiet else None
+					)
+					md5_future = executor.submit(create_package_md5_file, package_archive, progress_callback=progress_callback)
+				if zsync:
+					logger.info("Creating zsync file for '%s'", package_archive)
+					progress_callback = (
+						ProgressCallbackAdapter(progress, "[cyan]Creating zsync file...").progress_callback if not config.quiet else None
+					)
+					zsync_future = executor.submit(create_package_zsync_file, package_archive, progress_callback=progress_callback)
+				if md5_future:
+					md5_file = md5_future.result()
+				if zsync_future:
+					zsync_file = zsync_future.result()
 		except Exception as err:
 			logger.error(err, exc_info=True)
 			raise err
@@ -131,23 +142,24 @@ def make(
 def combine_products(product_dict: dict, product_on_depot_dict: dict) -> list:
 	"""
 	Returns a list of dictionaries, each has combined product and product on depot information
+
+	product_dict is keyed by (product id, product version, package version) tuples,
+	product_on_depot_dict is keyed by (depot id, product id) tuples
 	"""
 	combined_products = []
-	for depot_id, products in product_on_depot_dict.items():
-		for product_id in sorted(products):
-			pod = products[product_id]
-			product = product_dict.get(pod.productId, {}).get(pod.productVersion, {}).get(pod.packageVersion)
-			if product:
-				combined_products.append(
-					{
-						"depot_id": depot_id,
-						"product_id": product_id,
-						"name": product.name,
-						"description": product.description,
-						"product_version": product.productVersion,
-						"package_version": product.packageVersion,
-					}
-				)
+	for (depot_id, product_id), pod in sorted(product_on_depot_dict.items(), key=itemgetter(0)):
+		product = product_dict.get((pod.productId, pod.productVersion, pod.packageVersion))
+		if product:
+			combined_products.append(
+				{
+					"depot_id": depot_id,
+					"product_id": product_id,
+					"name": product.name,
+					"description": product.description,
+					"product_version": product.productVersion,
+					"package_version": product.packageVersion,
+				}
+			)
 	return combined_products
 
 
@@ -164,18 +176,27 @@ def package_list(depots: str, product_ids: list[str]) -> None:
 	"""
 	logger.trace("list packages")
 	depots = depots.strip() or "all"
-	depot_list = [depot.strip() for depot in depots.split(",") if depot.strip() != "all"]
+	# Only send non-empty filters, an empty filter matches everything anyway
+	product_on_depot_filter: dict[str, list[str]] = {}
+	if depots != "all":
+		depot_list = [depot for depot in (depot.strip() for depot in depots.split(",")) if depot != "all"]
+		if depot_list:
+			product_on_depot_filter["depotId"] = depot_list
+	product_filter: dict[str, list[str]] = {}
+	if product_ids:
+		product_on_depot_filter["productId"] = product_filter["id"] = list(product_ids)
 
 	try:
 		service_client = get_service_connection()
-		product_list = service_client.jsonrpc("product_getObjects")
-		product_on_depot_list = service_client.jsonrpc("productOnDepot_getObjects", [[], {"depotId": depot_list, "productId": product_ids}])
+		# Ident attributes (id, productVersion, packageVersion) are always returned
+		product_list = service_client.jsonrpc("product_getObjects", [["name", "description"], product_filter])
+		product_on_depot_list = service_client.jsonrpc("productOnDepot_getObjects", [[], product_on_depot_filter])
 	except Exception as err:
 		logger.error(err, exc_info=True)
 		raise err
 
-	product_dict = create_nested_dict(product_list, ["id", "productVersion", "packageVersion"])
-	product_on_depot_dict = create_nested_dict(product_on_depot_list, ["depotId", "productId"])
+	product_dict = create_flat_dict(product_list, ["id", "productVersion", "packageVersion"])
+	product_on_depot_dict = create_flat_dict(product_on_depot_list, ["depotId", "productId"])
 
 	combined_products = combine_products(product_dict, product_on_depot_dict)
 	metadata = command_metadata.get("package_list")
@@ -236,7 +257,7 @@ def extract(package_archive: Path, destination_dir: Path, new_product_id: str, o
 		opsi_package = OpsiPackage()
 		try:
 			opsi_package.extract_package_archive(
-				Path(package_archive),
+				package_archive,
 				destination=destination_dir,
 				new_product_id=new_product_id,
 				progress_listener=progress_listener,
@@ -279,15 +300,26 @@ def install(packages: list[str], depots: str, force: bool, update_properties: bo
 		if update_properties and config.interactive:
 			update_product_properties(path_to_opsipackage_dict)
 
+		# Fetch property states for all depots and products at once
+		property_states = (
+			{}
+			if update_properties and config.interactive
+			else get_property_states(
+				service_client,
+				[depot.id for depot in depot_objects],
+				[opsi_package.product.id for opsi_package in path_to_opsipackage_dict.values()],
+			)
+		)
+
 		for depot in depot_objects:
 			depot_connection = get_depot_connection(depot)
 			try:
 				for package_path, opsi_package in path_to_opsipackage_dict.items():
 					dest_package_name = fix_custom_package_name(package_path)
-					upload_to_repository(depot_connection, depot.id, package_path, dest_package_name, temp_dir)
+					upload_to_repository(depot_connection, depot.id, package_path, dest_package_name, opsi_package.product.id, temp_dir)
 
 					property_default_values = get_property_default_values(
-						service_client,
+						property_states,
 						depot.id,
 						opsi_package,
 						update_properties,
@@ -319,12 +351,20 @@ def uninstall(product_ids: list[str], depots: str, force: bool, keep_files: bool
 	if not product_on_depot_list:
 		raise click.UsageError("No products found to uninstall.")
 
+	product_ids_by_depot: dict[str, list[str]] = {}
+	for product_on_depot in product_on_depot_list:
+		product_ids_by_depot.setdefault(product_on_depot.depotId, []).append(product_on_depot.productId)
+
 	for depot in depot_objects:
+		depot_product_ids = product_ids_by_depot.get(depot.id)
+		if not depot_product_ids:
+			logger.info("No products to uninstall on depot %s", depot.id)
+			continue
 		depot_connection = get_depot_connection(depot)
 		try:
-			for product_on_depot in product_on_depot_list:
-				cleanup_packages_from_repo(depot_connection, product_on_depot.productId)
-				uninstall_package(depot_connection, depot.id, product_on_depot.productId, force, not keep_files)
+			for product_id in depot_product_ids:
+				cleanup_packages_from_repo(depot_connection, product_id)
+				uninstall_package(depot_connection, depot.id, product_id, force, not keep_files)
 		finally:
 			depot_connection.disconnect()
 
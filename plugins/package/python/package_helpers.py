@@ -3,6 +3,8 @@ Support functions for installing packages.
 """
 
 import shutil
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import nullcontext
 from functools import lru_cache
 from pathlib import Path
@@ -24,6 +26,7 @@ from opsicli.utils import ProgressCallbackAdapter, download
 from .package_progress import PackageProgressListener
 
 DEPOT_REPOSITORY_PATH = "/var/lib/opsi/repository"
+PACKAGE_PARSE_WORKERS = 8
 
 
 logger = get_logger("opsicli")
@@ -119,25 +122,48 @@ def map_and_sort_packages(packages: list[str]) -> dict[Path, OpsiPackage]:
 
 	Each package is placed after its dependencies in the dictionary.
 	"""
-	path_to_opsipackage_dict = {Path(pkg): OpsiPackage(Path(pkg)) for pkg in packages}
+	package_paths = [Path(pkg) for pkg in packages]
+	if len(package_paths) > 1:
+		# Parsing reads the control data from each archive, parse them concurrently
+		with ThreadPoolExecutor(max_workers=min(PACKAGE_PARSE_WORKERS, len(package_paths))) as executor:
+			opsi_packages = list(executor.map(OpsiPackage, package_paths))
+	else:
+		opsi_packages = [OpsiPackage(path) for path in package_paths]
+	path_to_opsipackage_dict = dict(zip(package_paths, opsi_packages))
+	if not any(opsi_package.package_dependencies for opsi_package in opsi_packages):
+		return path_to_opsipackage_dict
 	product_id_to_path = {pkg.product.id: path for path, pkg in path_to_opsipackage_dict.items()}
-	result = {}
-	visited = set()
 
-	def visit(path: Path) -> None:
-		if path in visited:
-			return
-		visited.add(path)
-		opsi_package = path_to_opsipackage_dict[path]
+	# Topological sort (Kahn), packages without pending dependencies are taken in the given order
+	dependents: dict[Path, list[Path]] = {path: [] for path in path_to_opsipackage_dict}
+	in_degree: dict[Path, int] = {}
+	for path, opsi_package in path_to_opsipackage_dict.items():
+		dep_paths = set()
 		for dep in opsi_package.package_dependencies or []:
 			dep_path = product_id_to_path.get(dep.package)
 			if dep_path is None:
 				raise ValueError(f"Dependency '{dep.package}' for package '{opsi_package.product.id}' is not specified.")
-			visit(dep_path)
-		result[path] = opsi_package
+			if dep_path != path:
+				dep_paths.add(dep_path)
+		for dep_path in dep_paths:
+			dependents[dep_path].append(path)
+		in_degree[path] = len(dep_paths)
 
-	for path in path_to_opsipackage_dict:
-		visit(path)
+	result = {}
+	queue = deque(path for path, degree in in_degree.items() if degree == 0)
+	while queue:
+		path = queue.popleft()
+		result[path] = path_to_opsipackage_dict[path]
+		for dependent in dependents[path]:
+			in_degree[dependent] -= 1
+			if in_degree[dependent] == 0:
+				queue.append(dependent)
+
+	if len(result) < len(path_to_opsipackage_dict):
+		remaining = [path for path in path_to_opsipackage_dict if path not in result]
+		logger.warning("Circular dependencies between packages: %s", ", ".join(str(path) for path in remaining))
+		for path in remaining:
+			result[path] = path_to_opsipackage_dict[path]
 	return result
 
 
@@ -398,6 +424,7 @@ def upload_to_repository(
 	depot_id: str,
 	source_package: Path,
 	dest_package_name: str,
+	product_id: str,
 	temp_dir: Path,
 ) -> None:
 	"""
@@ -430,12 +457,37 @@ def upload_to_repository(
 
 		logger.notice("Finished upload of file %r to depot %r", filename, depot_id)
 
-	cleanup_packages_from_repo(depot_connection, OpsiPackage(source_package).product.id, dest_package_name)
+	cleanup_packages_from_repo(depot_connection, product_id, dest_package_name)
 	validate_upload_and_check_disk_space(depot_connection, depot_id, local_checksum, dest_package_name)
 
 
-def get_property_default_values(
+def get_property_states(
 	service_client: ServiceClient,
+	depot_ids: list[str],
+	product_ids: list[str],
+) -> dict[tuple[str, str], dict[str, list[Any]]]:
+	"""
+	Fetch the product property states of all given depots and products with a single call.
+
+	Returns the property values keyed by (depot id, product id).
+	"""
+	property_states: dict[tuple[str, str], dict[str, list[Any]]] = {}
+	if not depot_ids or not product_ids:
+		# Empty lists would not restrict the filter
+		return property_states
+	product_property_states = service_client.jsonrpc(
+		"productPropertyState_getObjects",
+		[[], {"productId": product_ids, "objectId": depot_ids}],
+	)
+	for prod_prop_state in product_property_states:
+		property_states.setdefault((prod_prop_state.objectId, prod_prop_state.productId), {})[prod_prop_state.propertyId] = (
+			prod_prop_state.values or []
+		)
+	return property_states
+
+
+def get_property_default_values(
+	property_states: dict[tuple[str, str], dict[str, list[Any]]],
 	depot_id: str,
 	opsi_package: OpsiPackage,
 	update_properties: bool,
@@ -444,23 +496,11 @@ def get_property_default_values(
 	Get the default values for the product properties.
 
 	If `update_properties` is True and in interactive mode, get user-updated values.
-	Otherwise, fetch property states for the depot from `productPropertyState_getObjects`.
+	Otherwise, use the property states of the depot as returned by `get_property_states`.
 	"""
-	product_id = opsi_package.product.id
-	property_default_values = {}
-
 	if update_properties and config.interactive:
-		property_default_values = {
-			product_property.propertyId: product_property.defaultValues or [] for product_property in opsi_package.product_properties
-		}
-	else:
-		product_property_states = service_client.jsonrpc(
-			"productPropertyState_getObjects",
-			[[], {"productId": product_id, "objectId": depot_id}],
-		)
-		property_default_values = {prod_prop_state.propertyId: prod_prop_state.values or [] for prod_prop_state in product_property_states}
-
-	return property_default_values
+		return {product_property.propertyId: product_property.defaultValues or [] for product_property in opsi_package.product_properties}
+	return property_states.get((depot_id, opsi_package.product.id), {})
 
 
 def install_package(
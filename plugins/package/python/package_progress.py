@@ -3,17 +3,10 @@ This module provides a progress listener for various package operations using th
 """
 
 from opsicommon.package.archive import ArchiveProgress, ArchiveProgressListener
-from rich.progress import Progress
 
+from opsicli.utils import ProgressCallbackAdapter
 
-class PackageProgressListener(ArchiveProgressListener):
-	def __init__(self, progress: Progress, task_message: str):
-		self.progress = progress
-		self.started = False
-		self.task_id = self.progress.add_task(task_message, total=None)
 
+class PackageProgressListener(ProgressCallbackAdapter, ArchiveProgressListener):
 	def progress_changed(self, progress: ArchiveProgress) -> None:
-		if not self.started:
-			self.started = True
-			self.progress.tasks[self.task_id].total = 100
-		self.progress.update(self.task_id, completed=progress.percent_completed)
+		self.progress_callback(progress.percent_completed, 100)
@@ -26,3 +26,10 @@ def test_read_write_cache() -> None:
 	cache.set("testkey", "othertestvalue")
 	cache.load()
 	assert cache.get("testkey") == "testvalue"
+
+
+def test_cache_delete() -> None:
+	cache.set("testkey", "testvalue")
+	cache.delete("testkey")
+	assert cache.get("testkey") is None
+	cache.delete("testkey")
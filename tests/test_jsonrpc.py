@@ -2,8 +2,14 @@
 test_jsonrpc
 """
 
+from types import SimpleNamespace
+from typing import Any
+
 import pytest
 
+from opsicli.cache import cache
+from plugins.jsonrpc.python import INTERFACE_CACHE_KEY, complete_methods, complete_params, parse_param
+
 from .utils import container_connection, run_cli
 
 
@@ -34,3 +40,48 @@ def test_create_delete_object() -> None:
 		print(stdout)
 		assert exit_code == 0
 		assert testclient not in stdout
+
+
+def patch_cached_interface(monkeypatch: pytest.MonkeyPatch, interface: list[dict[str, Any]]) -> None:
+	# Do not touch the real cache, it is stored on exit
+	def get(name: str, default: Any = None) -> Any:
+		return interface if name == INTERFACE_CACHE_KEY else default
+
+	monkeypatch.setattr(cache, "get", get)
+
+
+def test_complete_methods(monkeypatch: pytest.MonkeyPatch) -> None:
+	def complete(incomplete: str) -> list[str]:
+		return [item.value for item in complete_methods(None, None, incomplete)]  # type: ignore[arg-type]
+
+	method_names = sorted(["host_getObjects", "host_getIdents", "hostControl_start", "product_getObjects"])
+	patch_cached_interface(monkeypatch, [{"name": name, "params": []} for name in method_names])
+	assert complete("host_") == ["host_getIdents", "host_getObjects"]
+	assert complete("host") == ["hostControl_start", "host_getIdents", "host_getObjects"]
+	assert complete("") == ["hostControl_start", "host_getIdents", "host_getObjects", "product_getObjects"]
+	assert complete("x") == []
+
+
+def test_complete_params(monkeypatch: pytest.MonkeyPatch) -> None:
+	def complete(method: str, params: tuple[str, ...]) -> list[str]:
+		ctx = SimpleNamespace(params={"method": method, "params": params})
+		return [item.value for item in complete_params(ctx, None, "")]  # type: ignore[arg-type]
+
+	patch_cached_interface(
+		monkeypatch,
+		[{"name": "host_createOpsiClient", "params": ["id", "*opsiHostKey"]}, {"name": "host_getObjects", "params": ["attributes"]}],
+	)
+	assert complete("host_createOpsiClient", ()) == ["id"]
+	assert complete("host_createOpsiClient", ("client.test.tld",)) == ["*opsiHostKey"]
+	assert complete("host_createOpsiClient", ("client.test.tld", "key")) == []
+	assert complete("host_create", ()) == []
+	assert complete("host_getObjectsX", ()) == []
+
+
+def test_parse_param() -> None:
+	assert parse_param("[]") == []
+	assert parse_param('{"id": "client.test.tld"}') == {"id": "client.test.tld"}
+	assert parse_param("1") == 1
+	assert parse_param("client.test.tld") == "client.test.tld"
+	assert parse_param('say "hello"') == 'say "hello"'
+	assert parse_param("C:\\temp") == "C:\\temp"
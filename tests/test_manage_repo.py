@@ -3,6 +3,7 @@ test_repository
 """
 
 import shutil
+import sys
 from pathlib import Path
 
 import zstandard
@@ -40,6 +41,10 @@ def test_metafile_create(tmp_path: Path) -> None:
 		assert data["packages"]["localboot_new"]["1.0-1"]["url"] == "localboot_new_1.0-1.opsi"
 		assert data["packages"]["test-netboot"]["1.0-2"]["url"] == "subdir/test-netboot_1.0-2.opsi"
 
+	if sys.platform != "win32":
+		# The directory itself is locked, no lock file is left behind
+		assert not (repository_dir / ".packages.lock").exists()
+
 	# Recreate without scanning, other name and formats
 	cmd = ["-l6", "manage-repo", "metafile", "create", str(repository_dir), "--format=json", "--repository-name=myrepo"]
 	exit_code, stdout, _stderr = run_cli(cmd)
@@ -124,6 +129,20 @@ def test_metafile_scan_packages(tmp_path: Path) -> None:
 		assert len(data["packages"]["test-netboot"]) == 1
 
 
+def test_metafile_missing_directory(tmp_path: Path) -> None:
+	repository_dir = tmp_path / "missing-dir"
+
+	for cmd in (
+		["-l6", "manage-repo", "metafile", "scan-packages", str(repository_dir)],
+		["-l6", "manage-repo", "metafile", "add-package", str(repository_dir), str(TEST_REPO / "localboot_new_42.0-1337.opsi")],
+		["-l6", "manage-repo", "metafile", "remove-package", str(repository_dir), "localboot_new", "42.0-1337"],
+	):
+		exit_code, _stdout, stderr = run_cli(cmd)
+		assert exit_code == 1
+		assert "No metadata files" in stderr
+	assert not repository_dir.exists()
+
+
 def test_metafile_add_package(tmp_path: Path) -> None:
 	repository_dir = tmp_path / "repository-dir"
 	formats = ["json", "msgpack", "msgpack.zstd"]
@@ -4,11 +4,13 @@ test_messagebus
 
 import time
 from threading import Thread
+from unittest.mock import MagicMock, patch
 
 import pytest
 from opsicommon.client.opsiservice import ServiceClient
+from opsicommon.messagebus.message import TerminalDataReadMessage
 
-from opsicli.messagebus import JSONRPCMessagebusConnection
+from opsicli.messagebus import JSONRPCMessagebusConnection, TerminalMessagebusConnection
 from opsicli.opsiservice import get_service_connection
 
 from .utils import container_connection, run_cli
@@ -123,3 +125,32 @@ def test_wait_for_event_data() -> None:
 		cht.join()
 		service_connection.jsonrpc("host_delete", params=["dummy.test.tld"])
 		assert exit_code == 1  # timeout reached
+
+
+@pytest.mark.parametrize(
+	"data, application_mode, expected_mode",
+	(
+		(b"\x1b[?1h", False, True),
+		(b"\x1b[?1l", True, False),
+		(b"\x1b[?1049h", True, False),
+		(b"output\x1b[?1", True, True),
+		(b"output\x1b[?1", False, False),
+		(b"\x1b[?1h\x1b[?25h\x1b[?1l", False, False),
+		(b"\x1b[?1l text \x1b[?1h", True, True),
+	),
+)
+def test_terminal_data_read_application_mode(
+	capsysbinary: pytest.CaptureFixture[bytes], data: bytes, application_mode: bool, expected_mode: bool
+) -> None:
+	with patch("opsicli.messagebus.get_service_connection", MagicMock()):
+		connection = TerminalMessagebusConnection()
+	connection.terminal_id = "terminal-id"
+	connection._is_windows = True
+	connection._application_mode = application_mode
+
+	connection._on_terminal_data_read(
+		TerminalDataReadMessage(sender="service:worker:test:1", channel="session:test", terminal_id="terminal-id", data=data)
+	)
+
+	assert connection._application_mode is expected_mode
+	assert capsysbinary.readouterr().out == data
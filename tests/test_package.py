@@ -3,13 +3,16 @@ test_package.py is a test file for the package plugin.
 """
 
 from pathlib import Path
+from types import SimpleNamespace
 from typing import Optional, Union
+from unittest.mock import MagicMock, call, patch
 
 import pytest
 from opsicommon.objects import LocalbootProduct, ProductOnDepot
 from opsicommon.testing.helpers import http_test_server
 
-from plugins.package.python import combine_products
+from plugins.package import python as package_plugin
+from plugins.package.python import combine_products, uninstall
 
 from .utils import container_connection, run_cli
 
@@ -268,8 +271,8 @@ def test_combine_products() -> None:
 		productId="testproduct", depotId="depot1.test.local", productType="LocalbootProduct", productVersion="1.0", packageVersion="1"
 	)
 
-	product_dict = {"testproduct": {"1.0": {"1": product}}}
-	product_on_depot_dict = {"depot1.test.local": {"testproduct": product_on_depot}}
+	product_dict = {("testproduct", "1.0", "1"): product}
+	product_on_depot_dict = {("depot1.test.local", "testproduct"): product_on_depot}
 
 	expected = [
 		{
@@ -285,6 +288,40 @@ def test_combine_products() -> None:
 	assert combine_products(product_dict, product_on_depot_dict) == expected
 
 
+def test_uninstall_products_per_depot() -> None:
+	depot_objects = [SimpleNamespace(id=depot_id) for depot_id in ("depot1.test.local", "depot2.test.local", "depot3.test.local")]
+	service_client = MagicMock()
+	service_client.jsonrpc.return_value = [
+		ProductOnDepot(productId=product_id, depotId=depot_id, productType="LocalbootProduct", productVersion="1.0", packageVersion="1")
+		for depot_id, product_id in (
+			("depot1.test.local", "product1"),
+			("depot1.test.local", "product2"),
+			("depot2.test.local", "product2"),
+		)
+	]
+	depot_connections = {depot.id: MagicMock() for depot in depot_objects}
+
+	with (
+		patch.object(package_plugin, "get_service_connection", return_value=service_client),
+		patch.object(package_plugin, "get_depot_objects", return_value=depot_objects),
+		patch.object(package_plugin, "get_depot_connection", side_effect=lambda depot: depot_connections[depot.id]) as get_depot_connection,
+		patch.object(package_plugin, "cleanup_packages_from_repo"),
+		patch.object(package_plugin, "uninstall_package") as uninstall_package,
+	):
+		uninstall.callback(product_ids=("product1", "product2"), depots="all", force=False, keep_files=False)
+
+	# depot3 has none of the products, no connection is opened
+	assert [c.args[0].id for c in get_depot_connection.call_args_list] == ["depot1.test.local", "depot2.test.local"]
+	assert uninstall_package.call_args_list == [
+		call(depot_connections["depot1.test.local"], "depot1.test.local", "product1", False, True),
+		call(depot_connections["depot1.test.local"], "depot1.test.local", "product2", False, True),
+		call(depot_connections["depot2.test.local"], "depot2.test.local", "product2", False, True),
+	]
+	depot_connections["depot1.test.local"].disconnect.assert_called_once()
+	depot_connections["depot2.test.local"].disconnect.assert_called_once()
+	depot_connections["depot3.test.local"].disconnect.assert_not_called()
+
+
 @pytest.mark.requires_testcontainer
 def test_package_install_and_uninstall() -> None:
 	with container_connection():
@@ -3,11 +3,16 @@ test_package_helpers.py is a test file for the helpers functions used in the pac
 """
 
 from pathlib import Path
-from unittest.mock import patch
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
 
+import pytest
+
+from opsicommon.objects import ProductPropertyState
 from opsicommon.package import OpsiPackage
 
-from plugins.package.python.package_helpers import map_and_sort_packages, update_product_properties
+from plugins.package.python import package_helpers
+from plugins.package.python.package_helpers import get_property_states, map_and_sort_packages, update_product_properties
 
 TEST_DATA_PATH = Path("tests/test_data/plugins/package")
 
@@ -53,6 +58,44 @@ def test_map_and_sort_packages() -> None:
 		assert path in result
 		assert result[path].product.id == expected_package.product.id
 
+	# Every package must come after all of its dependencies
+	product_id_to_index = {opsi_package.product.id: index for index, opsi_package in enumerate(result.values())}
+	for index, opsi_package in enumerate(result.values()):
+		for dep in opsi_package.package_dependencies or []:
+			assert product_id_to_index[dep.package] < index
+
+
+def fake_opsi_package(dependencies: dict[str, list[str]]) -> MagicMock:
+	"""
+	Returns a replacement for OpsiPackage, the product id is the file name stem.
+	"""
+
+	def create(path: Path) -> SimpleNamespace:
+		return SimpleNamespace(
+			product=SimpleNamespace(id=path.stem),
+			package_dependencies=[SimpleNamespace(package=dep) for dep in dependencies[path.stem]],
+		)
+
+	return MagicMock(side_effect=create)
+
+
+def test_map_and_sort_packages_missing_dependency() -> None:
+	with patch.object(package_helpers, "OpsiPackage", fake_opsi_package({"pkg1": ["pkg2"]})):
+		with pytest.raises(ValueError, match="Dependency 'pkg2' for package 'pkg1' is not specified"):
+			map_and_sort_packages(["pkg1.opsi"])
+
+
+def test_map_and_sort_packages_circular_dependency() -> None:
+	dependencies = {"pkg1": ["pkg2"], "pkg2": ["pkg1"], "pkg3": [], "pkg4": ["pkg3"]}
+	with (
+		patch.object(package_helpers, "OpsiPackage", fake_opsi_package(dependencies)),
+		patch.object(package_helpers.logger, "warning") as warning,
+	):
+		result = map_and_sort_packages(["pkg1.opsi", "pkg2.opsi", "pkg3.opsi", "pkg4.opsi"])
+
+	warning.assert_called_once()
+	assert list(result) == [Path("pkg3.opsi"), Path("pkg4.opsi"), Path("pkg1.opsi"), Path("pkg2.opsi")]
+
 
 def test_update_product_properties() -> None:
 	"""
@@ -77,3 +120,26 @@ def test_update_product_properties() -> None:
 			assert product_property.defaultValues == ["new1", "value1"]
 		else:
 			assert product_property.defaultValues == [True]
+
+
+def test_get_property_states() -> None:
+	service_client = MagicMock()
+	service_client.jsonrpc.return_value = [
+		ProductPropertyState(productId="product1", propertyId="prop1", objectId="depot1.test.local", values=["a"]),
+		ProductPropertyState(productId="product1", propertyId="prop2", objectId="depot1.test.local", values=None),
+		ProductPropertyState(productId="product1", propertyId="prop1", objectId="depot2.test.local", values=["b"]),
+	]
+
+	property_states = get_property_states(service_client, ["depot1.test.local", "depot2.test.local"], ["product1"])
+
+	service_client.jsonrpc.assert_called_once()
+	assert property_states == {
+		("depot1.test.local", "product1"): {"prop1": ["a"], "prop2": []},
+		("depot2.test.local", "product1"): {"prop1": ["b"]},
+	}
+
+
+def test_get_property_states_without_depots() -> None:
+	service_client = MagicMock()
+	assert get_property_states(service_client, [], ["product1"]) == {}
+	service_client.jsonrpc.assert_not_called()
@@ -9,7 +9,7 @@ import pytest
 from opsicommon.logging import LOG_WARNING, use_logging_config
 from opsicommon.objects import LocalbootProduct
 
-from opsicli.utils import create_nested_dict, decrypt, encrypt, install_binary, retry
+from opsicli.utils import create_flat_dict, decrypt, encrypt, install_binary, retry
 
 
 @pytest.mark.parametrize(
@@ -82,7 +82,7 @@ def test_retry() -> None:
 		assert len(caught_exceptions) == 4
 
 
-def test_create_nested_dict() -> None:
+def test_create_flat_dict() -> None:
 	product1 = LocalbootProduct(id="product1", name="Product 1", productVersion="1.0.0", packageVersion="1")
 	product2 = LocalbootProduct(id="product2", name="Product 2", productVersion="1.0", packageVersion="3")
 	product3 = LocalbootProduct(id="product3", name="Product 3", productVersion="4.6.3.2172", packageVersion="3")
@@ -91,9 +91,9 @@ def test_create_nested_dict() -> None:
 	keys = ["id", "productVersion", "packageVersion"]
 
 	expected = {
-		"product1": {"1.0.0": {"1": product1}},
-		"product2": {"1.0": {"3": product2}},
-		"product3": {"4.6.3.2172": {"3": product3}},
+		("product1", "1.0.0", "1"): product1,
+		("product2", "1.0", "3"): product2,
+		("product3", "4.6.3.2172", "3"): product3,
 	}
 
-	assert create_nested_dict(list_of_objects, keys) == expected
+	assert create_flat_dict(list_of_objects, keys) == expected